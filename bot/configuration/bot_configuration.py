@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any
 
+from bot.data import close_all
 from bot.configuration.configuration import Configuration
 from bot.context.bot_context import BotContext
 from bot.context.setup_state import SetupState
@@ -25,6 +26,8 @@ def initialize(args: Dict[str, Any]) -> int:
         context.run()
     except KeyboardInterrupt:
         logger.info('SIGINT received, aborting ...')
+    finally:
+        close_all()
 
     return 0
 
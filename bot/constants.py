@@ -5,6 +5,7 @@ bot constants
 """
 DEFAULT_CONFIG = 'config.json'
 DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PROFILE_WORKERS = 8
 BASE_DIR = BASE_DIR
 PLUGIN_STRATEGIES_DIR = PLUGIN_STRATEGIES_DIR
 PLUGIN_DATA_PROVIDERS_DIR = PLUGIN_DATA_PROVIDERS_DIR
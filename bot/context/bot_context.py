@@ -1,10 +1,13 @@
 import logging
-from typing import Dict, Type, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Type, Any, List, Tuple
 from pandas import DataFrame
 
 from bot.utils import Singleton
 from bot import OperationalException
-from bot.data import DataProviderExecutor
+from bot.constants import DEFAULT_MAX_PROFILE_WORKERS
+from bot.data import DataProviderExecutor, add_ticker, add_tickers, remove_ticker, get_tickers, ticker_exists, \
+    get_existing_tickers
 from bot.context.bot_state import BotState
 from bot.strategies import StrategyExecutor
 
@@ -99,6 +102,69 @@ class BotContext(metaclass=Singleton):
     def strategy_executor(self, executor: StrategyExecutor) -> None:
         self._strategy_executor = executor
 
+    def add_ticker(self, ticker: str) -> None:
+        profile = self.data_provider_executor.get_profile(ticker)
+
+        if profile is None:
+            raise OperationalException("Could not find a company profile for ticker {}".format(ticker))
+
+        # Duplicates are detected by the unique ticker constraint
+        if not add_ticker(ticker, profile['company_name'], profile['category'], self.config):
+            raise OperationalException("Ticker {} is already in the registry".format(ticker))
+
+    def add_tickers(self, tickers: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Adds the given tickers to the registry in one batch. The company profiles are retrieved concurrently.
+        :return: the added tickers and the error messages of the tickers that could not be added
+        """
+        errors = []
+        new_tickers = []
+        existing_tickers = get_existing_tickers(tickers, self.config)
+
+        for ticker in tickers:
+
+            if ticker in existing_tickers:
+                errors.append("Ticker {} is already in the registry".format(ticker))
+            elif ticker not in new_tickers:
+                new_tickers.append(ticker)
+
+        if not new_tickers:
+            return [], errors
+
+        max_workers = min(len(new_tickers), DEFAULT_MAX_PROFILE_WORKERS)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.data_provider_executor.get_profile, ticker) for ticker in new_tickers]
+
+        rows = []
+
+        for ticker, future in zip(new_tickers, futures):
+
+            # A failing data provider only affects the ticker it was retrieving the profile for
+            if future.exception() is not None:
+                logger.warning("Could not retrieve company profile of {}: {}".format(ticker, future.exception()))
+                errors.append("Could not retrieve a company profile for ticker {}".format(ticker))
+            elif future.result() is None:
+                errors.append("Could not find a company profile for ticker {}".format(ticker))
+            else:
+                profile = future.result()
+                rows.append((ticker, profile['company_name'], profile['category']))
+
+        if rows:
+            add_tickers(rows, self.config)
+
+        return [row[0] for row in rows], errors
+
+    def remove_ticker(self, ticker: str) -> None:
+
+        if not ticker_exists(ticker, self.config):
+            raise OperationalException("Ticker {} is not in the registry".format(ticker))
+
+        remove_ticker(ticker, self.config)
+
+    def list_tickers(self) -> List[str]:
+        return get_tickers(self.config)
+
     """
     The BotContext delegates part of its behavior to the current State object.
     """
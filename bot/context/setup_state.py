@@ -3,7 +3,7 @@ from typing import List
 
 from bot.context.bot_state import BotState
 from bot.context.bot_context import BotContext
-from bot.data import DataProvider, DataProviderExecutor
+from bot.data import DataProvider, DataProviderExecutor, create_tables
 from bot.context.data_providing_state import DataProvidingState
 from bot.strategies import ObservableStrategy, StrategyExecutor
 from bot.configuration.resolvers import get_data_provider_configurations, get_strategy_plugins, \
@@ -24,6 +24,9 @@ class SetupState(BotState):
 
         context = BotContext()
 
+        # Prepare the database, this also refreshes the query planner statistics
+        create_tables(context.config)
+
         # Configure and start all the services
 
         # Initialize all data providers
@@ -1,6 +1,8 @@
 import logging
 import sqlite3
-from typing import Dict, Any, List, Tuple
+from contextlib import contextmanager
+from threading import Lock, RLock
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 
 from bot import setup
 from bot.data.data_provider.data_provider import DataProvider
@@ -11,116 +13,273 @@ logger = logging.getLogger(__name__)
 TICKER_TABLE_NAME = 'TICKERS'
 TRADES_TABLE_NAME = 'TRADES'
 
+# Statements are kept identical between calls so that they are served from the connection statement cache
+_INSERT_TICKER_SQL = "INSERT OR IGNORE INTO TICKERS (ticker, company_name, category) VALUES (?, ?, ?)"
+_DELETE_TICKER_SQL = "DELETE FROM TICKERS WHERE ticker = ?"
+_TICKER_EXISTS_SQL = "SELECT 1 FROM TICKERS WHERE ticker = ? LIMIT 1"
+_SELECT_COMPANY_PROFILE_SQL = "SELECT ticker, company_name, category FROM TICKERS WHERE ticker = ? LIMIT 1"
+_SELECT_TICKERS_SQL = "SELECT ticker FROM TICKERS"
 
-def create_connection(config: Dict[str, Any]):
-    return sqlite3.connect(setup.get_database_file(config))
+# Long lived connections, keyed by database file, so that the sqlite page cache stays warm between calls
+_CONN_CACHE: Dict[str, sqlite3.Connection] = {}
+_CONN_CACHE_LOCK = Lock()
+
+# A connection is shared between threads, each data layer operation holds the lock of its connection
+_CONN_LOCKS: Dict[str, RLock] = {}
+
+# Registered tickers, keyed by database file, invalidated whenever the registry is modified
+_TICKERS_CACHE: Dict[str, List[str]] = {}
+
+
+def create_connection(config: Dict[str, Any]) -> sqlite3.Connection:
+    # Connections are shared between the bot and service threads (e.g. telegram)
+    con = sqlite3.connect(setup.get_database_file(config), check_same_thread=False, cached_statements=256)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA temp_store=MEMORY")
+    con.execute("PRAGMA cache_size=-20000")
+    return con
+
+
+def get_connection(config: Dict[str, Any]) -> sqlite3.Connection:
+    """
+    Returns the cached connection for the configured database, the connection is created on first use.
+    """
+    database_file = setup.get_database_file(config)
+
+    with _CONN_CACHE_LOCK:
+        con = _CONN_CACHE.get(database_file)
+
+        if con is None:
+            logger.info("Opening database connection {} ...".format(database_file))
+            con = create_connection(config)
+            _CONN_CACHE[database_file] = con
+            _CONN_LOCKS[database_file] = RLock()
+
+    return con
+
+
+@contextmanager
+def _locked_connection(config: Dict[str, Any]) -> Iterator[sqlite3.Connection]:
+    """
+    Provides the cached connection for the configured database, while holding the lock of that connection.
+    """
+    database_file = setup.get_database_file(config)
+
+    while True:
+        con = get_connection(config)
+        lock = _CONN_LOCKS.get(database_file)
+
+        if lock is None:
+            continue
+
+        with lock:
+
+            # The connection could have been closed while waiting for the lock, use a new one in that case
+            if _CONN_CACHE.get(database_file) is con:
+                yield con
+                return
+
+
+def close_all() -> None:
+    """
+    Closes all cached database connections.
+    """
+    with _CONN_CACHE_LOCK:
+        connections = [
+            (database_file, con, _CONN_LOCKS.pop(database_file)) for database_file, con in _CONN_CACHE.items()
+        ]
+        _CONN_CACHE.clear()
+        _TICKERS_CACHE.clear()
+
+    # Wait for running operations to finish, before closing their connection
+    for database_file, con, lock in connections:
+
+        with lock:
+            logger.info("Closing database connection {} ...".format(database_file))
+            _optimize(con)
+            con.close()
+
+
+def _optimize(con: sqlite3.Connection) -> None:
+    """
+    Lets sqlite refresh the query planner statistics, should be run at startup and before closing a connection.
+    """
+    try:
+        con.execute("PRAGMA optimize")
+    except sqlite3.Error as e:
+        # The database can be locked by another process, the statistics will be refreshed next time
+        logger.warning("Could not optimize database: {}".format(e))
+
+
+def _first_column(cursor: sqlite3.Cursor, row: Tuple) -> Any:
+    """
+    Row factory for single column queries, returns the value instead of a 1-tuple.
+    """
+    return row[0]
+
+
+def _invalidate_tickers_cache(config: Dict[str, Any]) -> None:
+    _TICKERS_CACHE.pop(setup.get_database_file(config), None)
 
 
 def create_tables(config: Dict[str, Any]) -> None:
-    table_names = get_all_table_names(config)
+    integrity_check = config.get('database', {}).get('integrity_check', False)
 
-    if TICKER_TABLE_NAME not in table_names:
-        logger.info("Creating database table {} ...".format(TICKER_TABLE_NAME))
-        con = create_connection(config)
+    with _locked_connection(config) as con:
+        _create_tables(con, integrity_check)
 
-        # Create ticker tables
-        con.execute('''
-            CREATE TABLE TICKERS
-            ([ticker_id] INTEGER PRIMARY KEY, [ticker] text, [company_name] text, [category] text)
-        ''')
 
-        con.commit()
-        con.close()
+def _create_tables(con: sqlite3.Connection, integrity_check: bool) -> None:
 
-    if TRADES_TABLE_NAME not in table_names:
-        logger.info("Creating database table {} ...".format(TRADES_TABLE_NAME))
-        con = create_connection(config)
+    # All tables are created within one transaction, sqlite does not start one implicitly for DDL statements
+    with con:
 
-        # Create open trades table
-        con.execute('''
-            CREATE TABLE TRADES
-            ([trade_id] INTEGER PRIMARY KEY, [ticker_id] integer, [buy_date] timestamp)
-        ''')
+        if not con.in_transaction:
+            con.execute("BEGIN")
 
-        con.commit()
-        con.close()
+        table_names = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+        if TICKER_TABLE_NAME not in table_names:
+            logger.info("Creating database table {} ...".format(TICKER_TABLE_NAME))
+
+            # Create ticker tables
+            con.execute('''
+                CREATE TABLE IF NOT EXISTS TICKERS
+                ([ticker_id] INTEGER PRIMARY KEY, [ticker] text NOT NULL, [company_name] text, [category] text)
+            ''')
+
+        if TRADES_TABLE_NAME not in table_names:
+            logger.info("Creating database table {} ...".format(TRADES_TABLE_NAME))
+
+            # Create open trades table
+            con.execute('''
+                CREATE TABLE IF NOT EXISTS TRADES
+                ([trade_id] INTEGER PRIMARY KEY, [ticker_id] integer, [buy_date] timestamp)
+            ''')
+
+        # Databases created before the unique ticker constraint can contain duplicates, keep the first entry
+        cursor = con.execute(
+            "DELETE FROM TICKERS WHERE ticker_id NOT IN (SELECT MIN(ticker_id) FROM TICKERS GROUP BY ticker)"
+        )
 
+        if cursor.rowcount > 0:
+            logger.warning("Removed {} duplicate tickers from registry".format(cursor.rowcount))
 
-def add_ticker(ticker: str, company_name: str, category: str, config: Dict[str, Any]) -> None:
+        # Indexes are created here instead of in the table definitions, so existing databases get them as well
+        con.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_tickers_ticker ON TICKERS(ticker)')
+        con.execute('CREATE INDEX IF NOT EXISTS idx_trades_ticker_id ON TRADES(ticker_id)')
+
+    # The integrity check reads the whole database, so it only runs when enabled in the configuration
+    if integrity_check:
+        result = con.execute("PRAGMA integrity_check").fetchone()
+
+        if result[0] != 'ok':
+            logger.error("Database integrity check failed: {}".format(result[0]))
+
+    _optimize(con)
+
+
+def add_ticker(ticker: str, company_name: str, category: str, config: Dict[str, Any]) -> bool:
+    """
+    Adds a ticker to the registry.
+    :return: False if the ticker was already in the registry
+    """
 
     logger.info("Adding ticker {} to registry...".format(ticker))
 
-    con = create_connection(config)
-    cursor = con.cursor()
+    with _locked_connection(config) as con:
+        cursor = con.cursor()
 
-    # Add ticker if not exists
-    insert_statement = """
-           INSERT INTO TICKERS (ticker, company_name, category)
-           VALUES (?, ?, ?);
-       """
+        data_tuple = (ticker, company_name, category)
+        cursor.execute(_INSERT_TICKER_SQL, data_tuple)
 
-    data_tuple = (ticker, company_name, category)
-    cursor.execute(insert_statement, data_tuple)
+        con.commit()
+        _invalidate_tickers_cache(config)
+        return cursor.rowcount == 1
 
-    con.commit()
-    con.close()
+
+def add_tickers(rows: List[Tuple[str, str, str]], config: Dict[str, Any]) -> None:
+    """
+    Adds multiple tickers to the registry in a single transaction.
+    :param rows: list of (ticker, company_name, category) tuples
+    """
+
+    logger.info("Adding {} tickers to registry...".format(len(rows)))
+
+    with _locked_connection(config) as con:
+
+        with con:
+            con.executemany(_INSERT_TICKER_SQL, rows)
+
+        _invalidate_tickers_cache(config)
 
 
 def remove_ticker(ticker: str, config: Dict[str, Any]) -> None:
 
     logger.info("Removing ticker {} from registry ...".format(ticker))
-    con = create_connection(config)
-    cursor = con.cursor()
 
-    delete_statement = '''
-        DELETE from TICKERS where ticker = ? 
-    '''
+    with _locked_connection(config) as con:
+        cursor = con.cursor()
+
+        cursor.execute(_DELETE_TICKER_SQL, (ticker,))
+        con.commit()
+        _invalidate_tickers_cache(config)
+
 
-    cursor.execute(delete_statement, (ticker,))
-    con.commit()
-    con.close()
+def ticker_exists(ticker: str, config: Dict[str, Any]) -> bool:
+    with _locked_connection(config) as con:
+        cursor = con.cursor()
 
+        cursor.execute(_TICKER_EXISTS_SQL, (ticker, ))
+        return cursor.fetchone() is not None
 
-def get_company_profile(ticker: str, config: Dict[str, any]) -> Tuple[str]:
-    con = create_connection(config)
-    cursor = con.cursor()
 
+def get_company_profile(ticker: str, config: Dict[str, any]) -> Optional[Tuple[str, str, str]]:
     logger.info("Getting {} company info from registry ...".format(ticker))
 
-    cursor.execute(" SELECT * FROM TICKERS WHERE ticker=?", (ticker, ))
-    result = cursor.fetchall()
+    with _locked_connection(config) as con:
+        cursor = con.cursor()
 
-    con.close()
-    return result
+        cursor.execute(_SELECT_COMPANY_PROFILE_SQL, (ticker, ))
+        return cursor.fetchone()
 
 
 def get_tickers(config: Dict[str, any]) -> List[str]:
-    con = create_connection(config)
-    cursor = con.cursor()
+    database_file = setup.get_database_file(config)
+    result = _TICKERS_CACHE.get(database_file)
+
+    if result is None:
+        logger.info("Getting all tickers from registry ...")
+
+        with _locked_connection(config) as con:
+            cursor = con.cursor()
+            cursor.row_factory = _first_column
+
+            result = cursor.execute(_SELECT_TICKERS_SQL).fetchall()
+            _TICKERS_CACHE[database_file] = result
+
+    return list(result)
 
-    logger.info("Getting all tickers from registry ...")
 
-    # Get ticker if exists
-    select_statement = '''
-       SELECT (ticker) from TICKERS
-    '''
+def get_existing_tickers(tickers: List[str], config: Dict[str, Any]) -> Set[str]:
+    """
+    Returns the subset of the given tickers that are already in the registry, using a single query.
+    """
 
-    cursor.execute(select_statement)
-    result = cursor.fetchall()
-    con.close()
-    return result
+    if not tickers:
+        return set()
 
+    select_statement = "SELECT ticker FROM TICKERS WHERE ticker IN ({})".format(", ".join("?" * len(tickers)))
 
-def get_all_table_names(config: Dict[str, Any]) -> List[str]:
-    table_names = []
-    con = create_connection(config)
-    cursor = con.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+    with _locked_connection(config) as con:
+        cursor = con.cursor()
+        cursor.row_factory = _first_column
+        return set(cursor.execute(select_statement, tickers))
 
-    for table_name in tables:
-        table_names += table_name
 
-    return table_names
+def get_all_table_names(config: Dict[str, Any]) -> Set[str]:
+    with _locked_connection(config) as con:
+        return {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
 
 
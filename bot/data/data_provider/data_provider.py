@@ -1,5 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
 from pandas import DataFrame
 
 from bot.events.observable import Observable
@@ -60,6 +61,13 @@ class DataProvider(Observable):
     def clear(self):
         self._data = None
 
+    def get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the company profile of the given ticker, with at least the 'company_name' and 'category' keys.
+        Data providers that can't provide company profiles return None.
+        """
+        return None
+
     @abstractmethod
     def get_id(self) -> str:
         pass
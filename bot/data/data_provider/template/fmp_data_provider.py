@@ -1,5 +1,6 @@
 import logging
 import requests
+from typing import Any, Dict, Optional
 from pandas import DataFrame
 
 from bot.data.data_provider.data_provider import DataProvider
@@ -7,6 +8,9 @@ from bot.data.data_provider.data_provider import DataProvider
 TICKER_LIST = 'https://financialmodelingprep.com/api/v3/company/stock/list'
 PROFILE_ENDPOINT = 'https://financialmodelingprep.com/api/v3/company/profile/{}'
 
+# Timeout in seconds for profile requests, these are done while handling user commands
+PROFILE_REQUEST_TIMEOUT = 10
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,4 +27,16 @@ class FMPDataProvider(DataProvider):
         df = DataFrame(symbols_info)
         return df
 
+    def get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+        response = requests.get(PROFILE_ENDPOINT.format(ticker), timeout=PROFILE_REQUEST_TIMEOUT)
+        profile = response.json().get('profile')
+
+        if not profile:
+            return None
+
+        return {
+            'company_name': profile.get('companyName'),
+            'category': profile.get('sector')
+        }
+
 
@@ -1,5 +1,8 @@
 import logging
-from typing import List, Dict, Tuple
+from threading import Lock
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, List, Dict, Optional, Tuple
 
 from bot.utils import StoppableThread
 from bot.executors import WorkerExecutor
@@ -8,6 +11,9 @@ from bot.data.data_provider.data_provider import DataProvider, DataProviderExcep
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of company profiles kept in memory per executor
+PROFILE_CACHE_SIZE = 1024
+
 
 class DataProviderExecutor(WorkerExecutor):
 
@@ -23,6 +29,10 @@ class DataProviderExecutor(WorkerExecutor):
         if data_providers is not None:
             self._registered_data_providers = data_providers
 
+        # Company profiles are retrieved remotely, so they are cached per ticker for the lifetime of the executor
+        self._profiles: Dict[str, Dict[str, Any]] = OrderedDict()
+        self._profiles_lock = Lock()
+
     def create_jobs(self) -> List[Tuple[Observable, StoppableThread]]:
         jobs: List[(Observable, StoppableThread)] = []
 
@@ -31,6 +41,74 @@ class DataProviderExecutor(WorkerExecutor):
 
         return jobs
 
+    def get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the company profile of the given ticker, found profiles are cached. Tickers without a profile are
+        not cached, so a failed lookup (e.g. rate limited by the data provider) can be retried.
+        """
+
+        with self._profiles_lock:
+            profile = self._profiles.get(ticker)
+
+            if profile is not None:
+                self._profiles.move_to_end(ticker)
+                return profile
+
+        profile = self._get_profile(ticker)
+
+        if profile is not None:
+
+            with self._profiles_lock:
+                self._profiles[ticker] = profile
+
+                if len(self._profiles) > PROFILE_CACHE_SIZE:
+                    self._profiles.popitem(last=False)
+
+        return profile
+
+    def _get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the company profile of the first data provider that knows the given ticker. All data providers
+        are queried concurrently, the remaining requests are cancelled once a profile is found.
+        """
+
+        if len(self._registered_data_providers) < 2:
+            return self._registered_data_providers[0].get_profile(ticker) if self._registered_data_providers else None
+
+        pool = ThreadPoolExecutor(max_workers=len(self._registered_data_providers))
+        error = None
+
+        try:
+            pending = {
+                pool.submit(data_provider.get_profile, ticker) for data_provider in self._registered_data_providers
+            }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+
+                    if future.exception() is not None:
+                        logger.warning(
+                            "Data provider failed to get profile of {}: {}".format(ticker, future.exception())
+                        )
+                        error = future.exception()
+                    elif future.result() is not None:
+
+                        for remaining in pending:
+                            remaining.cancel()
+
+                        return future.result()
+        finally:
+            # Don't wait for the data providers that are still running, their results are not needed anymore
+            pool.shutdown(wait=False)
+
+        # Only fail when none of the data providers could answer
+        if error is not None:
+            raise error
+
+        return None
+
     @property
     def registered_data_providers(self) -> List[DataProvider]:
         return self._registered_data_providers
@@ -28,9 +28,94 @@ TICKERS_CONVERSATION_BUTTONS = [
     ['/add_tickers', '/remove_tickers', '/cancel']
 ]
 
+# Telegram keyboard markups, shared by all outgoing messages
+DEFAULT_KEYBOARD_MARKUP = ReplyKeyboardMarkup(DEFAULT_KEYBOARD_BUTTONS)
+STANDARD_CONVERSATION_MARKUP = ReplyKeyboardMarkup(STANDARD_CONVERSATION_BUTTONS)
+TICKERS_CONVERSATION_MARKUP = ReplyKeyboardMarkup(TICKERS_CONVERSATION_BUTTONS)
+
 # Conversation states
 ADDING, REMOVING, LISTING_TICKERS, CHOOSING = range(4)
 
+WELCOME_MESSAGE = "Hello my name is {}, I am an investment bot based on value investing principles. " \
+                  "How can I help you?"
+
+
+def _command_handler(command: str, callback_name: str) -> Callable[[Any], CommandHandler]:
+    """
+    Creates a factory for a CommandHandler, the callback is resolved on the given Telegram service instance
+    """
+    return lambda service: CommandHandler(command, getattr(service, callback_name))
+
+
+def _text_handler(callback_name: str) -> Callable[[Any], MessageHandler]:
+    """
+    Creates a factory for a text MessageHandler, the callback is resolved on the given Telegram service instance
+    """
+    return lambda service: MessageHandler(Filters.text, getattr(service, callback_name))
+
+
+# Handler specifications, instantiated for a Telegram service on startup
+COMMAND_HANDLERS = [
+    _command_handler('help', '_help'),
+    _command_handler('version', '_version'),
+    _command_handler('list_tickers', '_list_tickers'),
+]
+
+TICKERS_CONVERSATION_ENTRY_POINTS = [
+    _command_handler('add_or_remove_tickers', '_start_tickers_conversation')
+]
+
+TICKERS_CONVERSATION_STATES = {
+    CHOOSING: [
+        _command_handler('add_tickers', '_start_adding_tickers'),
+        _command_handler('remove_tickers', '_start_removing_tickers'),
+    ],
+    ADDING: [_text_handler('_add_tickers')],
+    REMOVING: [_text_handler('_remove_tickers')],
+}
+
+TICKERS_CONVERSATION_FALLBACKS = [
+    _command_handler('cancel', '_cancel_conversation')
+]
+
+
+def split_message(msg: str, max_length: int = MAX_TELEGRAM_MESSAGE_LENGTH) -> List[str]:
+    """
+    Splits a message into chunks that fit in a single telegram message, lines are kept together where possible.
+    Empty chunks are left out, so an empty message results in no chunks at all.
+    :param msg: message
+    :param max_length: maximum length of a chunk
+    :return: list of message chunks
+    """
+    chunks = []
+    chunk = None
+
+    for line in msg.split('\n'):
+
+        # Lines that don't fit in a single message are cut
+        while len(line) > max_length:
+
+            if chunk is not None:
+                chunks.append(chunk)
+                chunk = None
+
+            chunks.append(line[:max_length])
+            line = line[max_length:]
+
+        if chunk is None:
+            chunk = line
+        elif len(chunk) + len(line) + 1 > max_length:
+            chunks.append(chunk)
+            chunk = line
+        else:
+            chunk += '\n' + line
+
+    if chunk is not None:
+        chunks.append(chunk)
+
+    # Telegram rejects empty messages, blank lines at the chunk boundaries are dropped as well
+    return [chunk.strip('\n') for chunk in chunks if chunk.strip()]
+
 
 def authorized_only(command_handler: Callable[..., None]) -> Callable[..., Any]:
     """
@@ -43,21 +128,21 @@ def authorized_only(command_handler: Callable[..., None]) -> Callable[..., Any]:
         update = kwargs.get('update') or args[0]
 
         # Reject unauthorized messages
-        chat_id = int(self._bot.config['telegram']['chat_id'])
+        chat_id = self._authorized_chat_id
 
-        if int(update.message.chat_id) != chat_id:
+        if update.message.chat_id != chat_id:
             logger.info(
                 'Rejected unauthorized message from: %s',
                 update.message.chat_id
             )
-            return wrapper
+            return None
 
-        logger.info(
-            'Executing handler: %s for chat_id: %s',
-            command_handler.__name__,
-            chat_id
-        )
         try:
+            logger.info(
+                'Executing handler: %s for chat_id: %s',
+                command_handler.__name__,
+                chat_id
+            )
             return command_handler(self, *args, **kwargs)
         except Exception:
             logger.exception('Exception occurred within Telegram module')
@@ -77,33 +162,30 @@ class Telegram(Service):
         super().__init__(bot)
 
         self._updater: Updater = None
+        self._authorized_chat_id: int = None
+        self._chat_id_str: str = None
         self.startup()
 
     def startup(self) -> None:
+        # Resolve the chat id once, it is checked for every incoming update
+        self._authorized_chat_id = int(self._bot.config['telegram']['chat_id'])
+        self._chat_id_str = str(self._authorized_chat_id)
+
         self._updater = Updater(token=self._bot.config['telegram']['token'], workers=0,
                                 use_context=True)
 
         # States of adding a ticker
         ticker_conversation_handler = ConversationHandler(
-            entry_points=[CommandHandler('add_or_remove_tickers', self._start_tickers_conversation)],
+            entry_points=[create(self) for create in TICKERS_CONVERSATION_ENTRY_POINTS],
             states={
-                CHOOSING: [
-                    CommandHandler('add_tickers', self._start_adding_tickers),
-                    CommandHandler('remove_tickers', self._start_removing_tickers),
-                ],
-                ADDING: [MessageHandler(Filters.text, self._add_tickers)],
-                REMOVING: [MessageHandler(Filters.text, self._remove_tickers)],
+                state: [create(self) for create in handlers]
+                for state, handlers in TICKERS_CONVERSATION_STATES.items()
             },
-            fallbacks=[CommandHandler('cancel', self._cancel_conversation)]
+            fallbacks=[create(self) for create in TICKERS_CONVERSATION_FALLBACKS]
         )
 
         # Register command handler and start telegram message polling
-        handles = [
-            CommandHandler('help', self._help),
-            CommandHandler('version', self._version),
-            CommandHandler('list_tickers', self._list_tickers),
-            ticker_conversation_handler
-        ]
+        handles = [create(self) for create in COMMAND_HANDLERS] + [ticker_conversation_handler]
 
         for handle in handles:
             self._updater.dispatcher.add_handler(handle)
@@ -117,15 +199,11 @@ class Telegram(Service):
 
         bot_name = self._bot.config.get("telegram", {}).get("bot_name", "value investing bot")
 
-        reply_markup = ReplyKeyboardMarkup(DEFAULT_KEYBOARD_BUTTONS)
-        msg = "Hello my name is {}, I am an investment bot based on value investing principles. " \
-              "How can I help you?".format(bot_name)
-
         self._updater.bot.send_message(
-            self._bot.config['telegram']['chat_id'],
-            text=msg,
+            self._chat_id_str,
+            text=WELCOME_MESSAGE.format(bot_name),
             parse_mode=ParseMode.MARKDOWN,
-            reply_markup=reply_markup
+            reply_markup=DEFAULT_KEYBOARD_MARKUP
         )
 
     def cleanup(self) -> None:
@@ -151,46 +229,43 @@ class Telegram(Service):
         self._send_msg(message)
 
     def _send_msg(self, msg: str, parse_mode: ParseMode = ParseMode.MARKDOWN,
-                  keyboard_buttons: List[List[str]] = None) -> None:
+                  reply_markup: ReplyKeyboardMarkup = DEFAULT_KEYBOARD_MARKUP) -> None:
         """
-        Send given markdown message
+        Send given markdown message, messages exceeding the telegram message length are send in chunks
         :param msg: message
         :param parse_mode: telegram parse mode
-        :keyboard_buttons: list of strings representing the buttons
+        :param reply_markup: keyboard markup shown with the message
         :return: None
         """
 
-        if keyboard_buttons is None:
-            keyboard_buttons = DEFAULT_KEYBOARD_BUTTONS
-
-        reply_markup = ReplyKeyboardMarkup(keyboard_buttons)
+        for chunk in split_message(msg):
 
-        try:
             try:
-                self._updater.bot.send_message(
-                    self._bot.config['telegram']['chat_id'],
-                    text=msg,
-                    parse_mode=parse_mode,
-                    reply_markup=reply_markup
-                )
-            except NetworkError as network_err:
-                # Sometimes the telegram server resets the current connection,
-                # if this is the case we send the message again.
+                try:
+                    self._updater.bot.send_message(
+                        self._chat_id_str,
+                        text=chunk,
+                        parse_mode=parse_mode,
+                        reply_markup=reply_markup
+                    )
+                except NetworkError as network_err:
+                    # Sometimes the telegram server resets the current connection,
+                    # if this is the case we send the message again.
+                    logger.warning(
+                        'Telegram NetworkError: %s! Trying one more time.',
+                        network_err.message
+                    )
+                    self._updater.bot.send_message(
+                        self._chat_id_str,
+                        text=chunk,
+                        parse_mode=parse_mode,
+                        reply_markup=reply_markup
+                    )
+            except TelegramError as telegram_err:
                 logger.warning(
-                    'Telegram NetworkError: %s! Trying one more time.',
-                    network_err.message
-                )
-                self._updater.bot.send_message(
-                    self._bot.config['telegram']['chat_id'],
-                    text=msg,
-                    parse_mode=parse_mode,
-                    reply_markup=reply_markup
+                    'TelegramError: %s! Giving up on that message.',
+                    telegram_err.message
                 )
-        except TelegramError as telegram_err:
-            logger.warning(
-                'TelegramError: %s! Giving up on that message.',
-                telegram_err.message
-            )
 
     @authorized_only
     def _version(self, update: Update, context: CallbackContext) -> None:
@@ -204,37 +279,34 @@ class Telegram(Service):
 
     @authorized_only
     def _start_tickers_conversation(self, update: Update, context: CallbackContext):
-        self._send_msg("Make your choice", keyboard_buttons=TICKERS_CONVERSATION_BUTTONS)
+        self._send_msg("Make your choice", reply_markup=TICKERS_CONVERSATION_MARKUP)
         return CHOOSING
 
     @authorized_only
     def _start_adding_tickers(self, update: Update, context: CallbackContext):
         self._send_msg("Please provide the tickers separated by commas, if you submit "
-                       "one ticker you can leave out the comma", keyboard_buttons=STANDARD_CONVERSATION_BUTTONS)
+                       "one ticker you can leave out the comma", reply_markup=STANDARD_CONVERSATION_MARKUP)
         return ADDING
 
     @authorized_only
     def _start_removing_tickers(self, update: Update, context: CallbackContext):
         self._send_msg("Please provide the tickers separated by commas, if you submit "
-                       "one ticker you can leave out the comma", keyboard_buttons=STANDARD_CONVERSATION_BUTTONS)
+                       "one ticker you can leave out the comma", reply_markup=STANDARD_CONVERSATION_MARKUP)
         return REMOVING
 
     @authorized_only
     def _add_tickers(self, update: Update, context: CallbackContext):
         text = update.message.text
-        tickers = [ticker.strip() for ticker in text.split(',')]
-        added_tickers = []
+        tickers = [ticker.strip() for ticker in text.split(',') if ticker.strip()]
 
-        for ticker in tickers:
-
-            try:
-                self._add_ticker(ticker)
-                added_tickers.append(ticker)
-            except OperationalException as e:
-                self._send_msg(str(e))
+        added_tickers, errors = self._bot.add_tickers(tickers)
+        lines = errors
 
         if added_tickers:
-            self._send_msg("{} added".format(added_tickers))
+            lines.append("{} added".format(added_tickers))
+
+        if lines:
+            self._send_msg("\n".join(lines))
 
         return ConversationHandler.END
 
@@ -243,17 +315,22 @@ class Telegram(Service):
         text = update.message.text
         tickers = [ticker.strip() for ticker in text.split(',')]
         removed_tickers = []
+        lines = []
+        remove = self._bot.remove_ticker
 
         for ticker in tickers:
 
             try:
-                self._remove_ticker(ticker)
+                remove(ticker)
                 removed_tickers.append(ticker)
             except OperationalException as e:
-                self._send_msg(str(e))
+                lines.append(str(e))
 
         if removed_tickers:
-            self._send_msg("{} removed".format(removed_tickers))
+            lines.append("{} removed".format(removed_tickers))
+
+        if lines:
+            self._send_msg("\n".join(lines))
 
         return ConversationHandler.END
 
@@ -262,7 +339,11 @@ class Telegram(Service):
 
         try:
             tickers = self._bot.list_tickers()
-            self._send_msg(tickers)
+
+            if tickers:
+                self._send_msg("\n".join(tickers))
+            else:
+                self._send_msg("There are no tickers in the registry")
         except Exception as e:
             self._send_msg(str(e))
 
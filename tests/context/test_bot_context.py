@@ -0,0 +1,103 @@
+import logging
+import pytest
+from typing import Any, Dict, Optional
+from pandas import DataFrame
+
+from bot import OperationalException
+from bot.context.bot_context import BotContext
+from bot.data import DataProvider, DataProviderExecutor, close_all, create_tables
+from bot.events.observer import Observer
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    'AAPL': {'company_name': 'Apple Inc.', 'category': 'Technology'},
+    'MSFT': {'company_name': 'Microsoft Corporation', 'category': 'Technology'},
+    'KO': {'company_name': 'The Coca-Cola Company', 'category': 'Consumer Defensive'},
+}
+
+
+class DummyProfileDataProvider(DataProvider):
+
+    def provide_data(self) -> DataFrame:
+        return DataFrame()
+
+    def get_id(self) -> str:
+        return "DUMMY_PROFILE_PROVIDER"
+
+    def get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+
+        if ticker == 'ERROR':
+            raise ConnectionError("Data provider unavailable")
+
+        return PROFILES.get(ticker)
+
+    def add_observer(self, observer: Observer) -> None:
+        super().add_observer(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        super().remove_observer(observer)
+
+
+@pytest.fixture
+def context(tmp_path):
+    context = BotContext()
+    context.config = {'database': {'name': str(tmp_path / 'test_database')}}
+    context.data_provider_executor = DataProviderExecutor([DummyProfileDataProvider()])
+    create_tables(context.config)
+
+    yield context
+
+    close_all()
+
+
+def test_add_and_remove_ticker(context):
+    logger.info("TEST: test_add_and_remove_ticker")
+
+    context.add_ticker('AAPL')
+    assert context.list_tickers() == ['AAPL']
+
+    with pytest.raises(OperationalException):
+        context.add_ticker('AAPL')
+
+    with pytest.raises(OperationalException):
+        context.add_ticker('UNKNOWN')
+
+    context.remove_ticker('AAPL')
+    assert context.list_tickers() == []
+
+    with pytest.raises(OperationalException):
+        context.remove_ticker('AAPL')
+
+    logger.info("TEST FINISHED: test_add_and_remove_ticker")
+
+
+def test_add_tickers(context):
+    logger.info("TEST: test_add_tickers")
+
+    context.add_ticker('AAPL')
+
+    added_tickers, errors = context.add_tickers(['AAPL', 'MSFT', 'KO', 'MSFT', 'UNKNOWN'])
+
+    # Existing tickers are reported, duplicates in the request are added once
+    assert added_tickers == ['MSFT', 'KO']
+    assert errors == [
+        "Ticker AAPL is already in the registry",
+        "Could not find a company profile for ticker UNKNOWN"
+    ]
+    assert sorted(context.list_tickers()) == ['AAPL', 'KO', 'MSFT']
+
+    logger.info("TEST FINISHED: test_add_tickers")
+
+
+def test_add_tickers_with_failing_data_provider(context):
+    logger.info("TEST: test_add_tickers_with_failing_data_provider")
+
+    added_tickers, errors = context.add_tickers(['AAPL', 'ERROR', 'KO'])
+
+    # The other tickers are still added when the profile of one ticker can't be retrieved
+    assert added_tickers == ['AAPL', 'KO']
+    assert errors == ["Could not retrieve a company profile for ticker ERROR"]
+    assert sorted(context.list_tickers()) == ['AAPL', 'KO']
+
+    logger.info("TEST FINISHED: test_add_tickers_with_failing_data_provider")
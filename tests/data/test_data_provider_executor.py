@@ -0,0 +1,135 @@
+import logging
+from threading import Event
+from typing import Any, Dict, List, Optional
+from pandas import DataFrame
+
+from bot.data import DataProvider, DataProviderExecutor
+from bot.events.observer import Observer
+
+logger = logging.getLogger(__name__)
+
+
+class DummyProfileDataProvider(DataProvider):
+
+    def __init__(self, profiles: Dict[str, Dict[str, Any]], release: Event = None, release_other: Event = None,
+                 error: Exception = None, answered: List['DummyProfileDataProvider'] = None):
+        super(DummyProfileDataProvider, self).__init__()
+        self._profiles = profiles
+        self._release = release
+        self._release_other = release_other
+        self._error = error
+        self._answered = answered
+        self.finished = Event()
+        self.profile_requests = 0
+
+    def provide_data(self) -> DataFrame:
+        return DataFrame()
+
+    def get_id(self) -> str:
+        return "DUMMY_PROFILE_PROVIDER"
+
+    def get_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
+        self.profile_requests += 1
+
+        # Block until the test allows this data provider to answer
+        if self._release is not None:
+            self._release.wait(timeout=10)
+
+        if self._answered is not None:
+            self._answered.append(self)
+
+        self.finished.set()
+
+        if self._release_other is not None:
+            self._release_other.set()
+
+        if self._error is not None:
+            raise self._error
+
+        return self._profiles.get(ticker)
+
+    def add_observer(self, observer: Observer) -> None:
+        super().add_observer(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        super().remove_observer(observer)
+
+
+def test_get_profile_is_cached():
+    logger.info("TEST: test_get_profile_is_cached")
+
+    profile = {'company_name': 'Apple Inc.', 'category': 'Technology'}
+    data_provider = DummyProfileDataProvider({'AAPL': profile})
+
+    executor = DataProviderExecutor([data_provider])
+
+    assert executor.get_profile('AAPL') == profile
+    assert executor.get_profile('AAPL') == profile
+
+    # The second lookup of the same ticker should not reach the data provider
+    assert data_provider.profile_requests == 1
+
+    # Tickers without a profile are looked up again
+    assert executor.get_profile('UNKNOWN') is None
+    assert executor.get_profile('UNKNOWN') is None
+    assert data_provider.profile_requests == 3
+
+    logger.info("TEST FINISHED: test_get_profile_is_cached")
+
+
+def test_get_profile_does_not_wait_for_slow_data_providers():
+    logger.info("TEST: test_get_profile_does_not_wait_for_slow_data_providers")
+
+    profile = {'company_name': 'Apple Inc.', 'category': 'Technology'}
+    release = Event()
+    slow_data_provider = DummyProfileDataProvider({}, release=release)
+    executor = DataProviderExecutor([slow_data_provider, DummyProfileDataProvider({'AAPL': profile})])
+
+    assert executor.get_profile('AAPL') == profile
+
+    # The profile is returned while the slow data provider is still running
+    assert not slow_data_provider.finished.is_set()
+
+    release.set()
+    assert slow_data_provider.finished.wait(timeout=10)
+
+    logger.info("TEST FINISHED: test_get_profile_does_not_wait_for_slow_data_providers")
+
+
+def test_get_profile_waits_for_all_data_providers():
+    logger.info("TEST: test_get_profile_waits_for_all_data_providers")
+
+    answered = []
+    release = Event()
+    slow_data_provider = DummyProfileDataProvider({}, release=release, answered=answered)
+    # The fast data provider releases the slow one once it answered
+    fast_data_provider = DummyProfileDataProvider({}, release_other=release, answered=answered)
+    executor = DataProviderExecutor([slow_data_provider, fast_data_provider])
+
+    assert executor.get_profile('UNKNOWN') is None
+    assert answered == [fast_data_provider, slow_data_provider]
+
+    logger.info("TEST FINISHED: test_get_profile_waits_for_all_data_providers")
+
+
+def test_get_profile_with_failing_data_provider():
+    logger.info("TEST: test_get_profile_with_failing_data_provider")
+
+    profile = {'company_name': 'Apple Inc.', 'category': 'Technology'}
+    error = ConnectionError("Data provider unavailable")
+
+    executor = DataProviderExecutor(
+        [DummyProfileDataProvider({}, error=error), DummyProfileDataProvider({'AAPL': profile})]
+    )
+
+    # A failing data provider is ignored when another one knows the ticker
+    assert executor.get_profile('AAPL') == profile
+
+    # The error is raised when none of the data providers could answer
+    try:
+        executor.get_profile('UNKNOWN')
+        assert False, "Expected the data provider error to be raised"
+    except ConnectionError as e:
+        assert e is error
+
+    logger.info("TEST FINISHED: test_get_profile_with_failing_data_provider")
@@ -0,0 +1,156 @@
+import logging
+import sqlite3
+import pytest
+from threading import Thread
+
+from bot.data import get_connection, close_all, create_tables, add_ticker, add_tickers, remove_ticker, \
+    get_tickers, get_company_profile, ticker_exists, get_existing_tickers
+from bot.setup import get_database_file
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def config(tmp_path):
+    yield {'database': {'name': str(tmp_path / 'test_database')}}
+
+    # Always release the cached connections, also when a test fails
+    close_all()
+
+
+def test_connection_is_reused(config):
+    logger.info("TEST: test_connection_is_reused")
+
+    connection_one = get_connection(config)
+    connection_two = get_connection(config)
+
+    assert connection_one is connection_two
+
+    close_all()
+
+    # After closing a new connection should be opened
+    assert get_connection(config) is not connection_one
+
+    logger.info("TEST FINISHED: test_connection_is_reused")
+
+
+def test_add_and_remove_ticker(config):
+    logger.info("TEST: test_add_and_remove_ticker")
+
+    create_tables(config)
+
+    assert add_ticker('AAPL', 'Apple Inc.', 'Technology', config)
+    assert add_ticker('MSFT', 'Microsoft Corporation', 'Technology', config)
+
+    # Adding a ticker twice should be ignored
+    assert not add_ticker('AAPL', 'Apple Inc.', 'Technology', config)
+
+    assert len(get_tickers(config)) == 2
+    assert ticker_exists('AAPL', config)
+    assert get_company_profile('AAPL', config) == ('AAPL', 'Apple Inc.', 'Technology')
+
+    remove_ticker('AAPL', config)
+
+    assert len(get_tickers(config)) == 1
+    assert not ticker_exists('AAPL', config)
+    assert get_company_profile('AAPL', config) is None
+
+    logger.info("TEST FINISHED: test_add_and_remove_ticker")
+
+
+def test_add_tickers(config):
+    logger.info("TEST: test_add_tickers")
+
+    create_tables(config)
+
+    add_tickers(
+        [
+            ('AAPL', 'Apple Inc.', 'Technology'),
+            ('MSFT', 'Microsoft Corporation', 'Technology'),
+            ('KO', 'The Coca-Cola Company', 'Consumer Defensive')
+        ],
+        config
+    )
+
+    assert sorted(get_tickers(config)) == ['AAPL', 'KO', 'MSFT']
+    assert get_existing_tickers(['AAPL', 'GOOG', 'KO'], config) == {'AAPL', 'KO'}
+
+    logger.info("TEST FINISHED: test_add_tickers")
+
+
+def test_get_tickers_is_cached(config):
+    logger.info("TEST: test_get_tickers_is_cached")
+
+    create_tables(config)
+
+    add_ticker('AAPL', 'Apple Inc.', 'Technology', config)
+    assert len(get_tickers(config)) == 1
+
+    # Modifying the database outside the registry functions is not seen by the cached result
+    con = get_connection(config)
+    con.execute("DELETE FROM TICKERS")
+    con.commit()
+    assert len(get_tickers(config)) == 1
+
+    # Modifying the registry invalidates the cached result
+    add_ticker('MSFT', 'Microsoft Corporation', 'Technology', config)
+    assert len(get_tickers(config)) == 1
+
+    remove_ticker('MSFT', config)
+    assert len(get_tickers(config)) == 0
+
+    logger.info("TEST FINISHED: test_get_tickers_is_cached")
+
+
+def test_concurrent_registry_modifications(config):
+    logger.info("TEST: test_concurrent_registry_modifications")
+
+    create_tables(config)
+    results = []
+
+    def add_and_remove(ticker: str):
+
+        for _ in range(50):
+            results.append(add_ticker(ticker, 'Company', 'Category', config))
+            remove_ticker(ticker, config)
+
+    threads = [Thread(target=add_and_remove, args=('TICKER_{}'.format(index),)) for index in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Every insert should have been committed and detected as a new row
+    assert len(results) == 200
+    assert all(results)
+    assert get_tickers(config) == []
+
+    logger.info("TEST FINISHED: test_concurrent_registry_modifications")
+
+
+def test_duplicate_detection_on_legacy_database(config):
+    logger.info("TEST: test_duplicate_detection_on_legacy_database")
+
+    # Create a database with the schema from before the unique ticker index, containing a duplicate ticker
+    con = sqlite3.connect(get_database_file(config))
+    con.execute(
+        "CREATE TABLE TICKERS ([ticker_id] INTEGER PRIMARY KEY, [ticker] text, [company_name] text, [category] text)"
+    )
+    con.execute("CREATE TABLE TRADES ([trade_id] INTEGER PRIMARY KEY, [ticker_id] integer, [buy_date] timestamp)")
+    con.executemany(
+        "INSERT INTO TICKERS (ticker, company_name, category) VALUES (?, ?, ?)",
+        [('KO', 'The Coca-Cola Company', 'Consumer Defensive')] * 2
+    )
+    con.commit()
+    con.close()
+
+    create_tables(config)
+
+    assert get_tickers(config) == ['KO']
+    assert add_ticker('AAPL', 'Apple Inc.', 'Technology', config)
+    assert not add_ticker('AAPL', 'Apple Inc.', 'Technology', config)
+    assert sorted(get_tickers(config)) == ['AAPL', 'KO']
+
+    logger.info("TEST FINISHED: test_duplicate_detection_on_legacy_database")
@@ -0,0 +1,29 @@
+from bot.services.telegram import split_message, MAX_TELEGRAM_MESSAGE_LENGTH
+
+
+def test_split_message_short_message():
+    assert split_message("AAPL\nMSFT") == ["AAPL\nMSFT"]
+
+
+def test_split_message_empty_message():
+    assert split_message("") == []
+    assert split_message("\n\n") == []
+
+
+def test_split_message_keeps_lines_together():
+    message = "\n".join(["TICKER"] * 1000)
+    chunks = split_message(message)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= MAX_TELEGRAM_MESSAGE_LENGTH for chunk in chunks)
+    assert all(line == "TICKER" for chunk in chunks for line in chunk.split("\n"))
+    assert sum(len(chunk.split("\n")) for chunk in chunks) == 1000
+
+
+def test_split_message_cuts_long_lines():
+    assert split_message("abcdefg\nhi", max_length=3) == ["abc", "def", "g", "hi"]
+
+
+def test_split_message_blank_lines_at_chunk_boundaries():
+    assert split_message("ab\n\ncd", max_length=3) == ["ab", "cd"]
+    assert split_message("ab\n\n\n\ncd", max_length=2) == ["ab", "cd"]